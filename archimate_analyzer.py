@@ -1,27 +1,35 @@
-import xml.etree.ElementTree as ET
+try:
+    from lxml import etree as ET
+    HAS_LXML = True
+except ImportError:
+    import xml.etree.ElementTree as ET
+    HAS_LXML = False
 import networkx as nx
 from typing import List, Dict, Optional
 import json
-import matplotlib.pyplot as plt
+try:
+    import orjson
+except ImportError:
+    orjson = None
+from collections import Counter, defaultdict
+import re
+import sys
+from types import MappingProxyType
+
+# Shared read-only properties for elements without any <property> children
+EMPTY_PROPERTIES = MappingProxyType({})
 
 class ArchiMateElement:
+    """Parsed ArchiMate element; properties is a read-only mapping"""
+    __slots__ = ('id', 'name', 'type', 'layer', 'relationships', 'properties')
+
     def __init__(self, id: str, name: str, type: str, layer: str):
         self.id = id
         self.name = name
         self.type = type
         self.layer = layer
         self.relationships = []
-        self.properties = {}
-
-    def to_dict(self):
-        return {
-            'id': self.id,
-            'name': self.name,
-            'type': self.type,
-            'layer': self.layer,
-            'relationships': self.relationships,
-            'properties': self.properties
-        }
+        self.properties = EMPTY_PROPERTIES
 
 class ArchiMateAnalyzer:
     def __init__(self):
@@ -36,74 +44,145 @@ class ArchiMateAnalyzer:
             'technology': ['node', 'device', 'system-software', 'technology-service']
         }
 
-        # Define common risks by element type
+        # Precomputed lookups for _determine_layer: exact type names first,
+        # then one alternation per layer for types that merely contain them
+        self._type_to_layer = {t: layer for layer, types in self.layers.items() for t in types}
+        self._layer_patterns = [
+            (layer, re.compile('|'.join(map(re.escape, types))))
+            for layer, types in self.layers.items()
+        ]
+
+        # Define common risks by element type (tuples, so the catalog cannot be modified in place)
         self.element_risks = {
-            'business-process': [
+            'business-process': (
                 'Process efficiency',
                 'Business continuity',
                 'Compliance requirements',
                 'Resource allocation'
-            ],
-            'application-component': [
+            ),
+            'application-component': (
                 'Technical debt',
                 'Scalability limitations',
                 'Integration complexity',
                 'Maintenance overhead'
-            ],
-            'technology-service': [
+            ),
+            'technology-service': (
                 'Service availability',
                 'Performance bottlenecks',
                 'Security vulnerabilities',
                 'Infrastructure dependencies'
-            ]
+            )
         }
 
     def parse_archimate_model(self, file_path: str):
         """Parse ArchiMate model from XML file"""
-        tree = ET.parse(file_path)
-        root = tree.getroot()
-
-        # Parse elements
-        for elem in root.findall(".//element"):
-            element = ArchiMateElement(
-                id=elem.get('identifier'),
-                name=elem.get('name'),
-                type=elem.get('xsi:type'),
-                layer=self._determine_layer(elem.get('xsi:type'))
-            )
-
-            # Parse properties
-            for prop in elem.findall(".//property"):
-                element.properties[prop.get('key')] = prop.get('value')
-
-            self.elements[element.id] = element
-            self.graph.add_node(element.id, **element.to_dict())
-
-        # Parse relationships
-        for rel in root.findall(".//relationship"):
-            source = rel.get('source')
-            target = rel.get('target')
-            rel_type = rel.get('xsi:type')
-
-            if source and target:  # Only add if both source and target exist
-                self.relationships[rel.get('identifier')] = {
-                    'source': source,
-                    'target': target,
-                    'type': rel_type
-                }
-
-                self.graph.add_edge(source, target, type=rel_type)
-                if source in self.elements:
-                    self.elements[source].relationships.append(rel.get('identifier'))
-                if target in self.elements:
-                    self.elements[target].relationships.append(rel.get('identifier'))
+        # Collect into locals so a parse error leaves the analyzer unchanged
+        elements = {}
+        relationships = {}
+        edges = []
+        # Relationships may reference elements that appear later in the
+        # document, so back-references are resolved after the stream ends
+        element_refs = defaultdict(list)
+        # Models reuse a small set of types, so resolve each one only once
+        type_layers = {}
+
+        for event, node in self._iter_model_nodes(file_path):
+            if event == 'start':
+                # Reserve the slot so nested elements keep document order
+                if node.tag == 'element':
+                    elements.setdefault(node.get('identifier'))
+            elif node.tag == 'element':
+                element_type = node.get('xsi:type')
+                if element_type is not None:
+                    element_type = sys.intern(element_type)
+                layer = type_layers.get(element_type)
+                if layer is None:
+                    layer = type_layers[element_type] = self._determine_layer(element_type)
+
+                element = ArchiMateElement(
+                    id=node.get('identifier'),
+                    name=node.get('name'),
+                    type=element_type,
+                    layer=layer
+                )
+
+                # Parse properties, allocating a dict only when there are any
+                properties = None
+                for prop in node.iterfind(".//property"):
+                    if properties is None:
+                        properties = {}
+                    key = prop.get('key')
+                    if key is not None:
+                        key = sys.intern(key)
+                    properties[key] = prop.get('value')
+                if properties is not None:
+                    element.properties = MappingProxyType(properties)
+
+                elements[element.id] = element
+            else:
+                source = node.get('source')
+                target = node.get('target')
+                rel_type = node.get('xsi:type')
+
+                if source and target:  # Only add if both source and target exist
+                    rel_id = node.get('identifier')
+                    relationships[rel_id] = {
+                        'source': source,
+                        'target': target,
+                        'type': rel_type
+                    }
+
+                    edges.append((source, target, {'type': rel_type}))
+                    element_refs[source].append(rel_id)
+                    element_refs[target].append(rel_id)
+
+        self.elements.update(elements)
+        self.relationships.update(relationships)
+        self.graph.add_nodes_from(elements)
+        self.graph.add_edges_from(edges)
+        for element_id, rel_ids in element_refs.items():
+            if element_id in self.elements:
+                self.elements[element_id].relationships.extend(rel_ids)
+
+    def _iter_model_nodes(self, file_path: str):
+        """Yield (event, node) pairs for element and relationship nodes
+
+        Nodes are complete on 'end'. The lxml stream also reports 'start' so
+        callers can record document order before nested nodes finish.
+        """
+        if HAS_LXML:
+            # Number of matched nodes currently open around the stream position
+            depth = 0
+            for event, node in ET.iterparse(file_path, events=('start', 'end'), tag=('element', 'relationship')):
+                yield event, node
+
+                if event == 'start':
+                    depth += 1
+                    continue
+                depth -= 1
+
+                # Release the handled subtree and any already-processed
+                # siblings, unless an enclosing match still needs its content
+                if not depth:
+                    node.clear()
+                    while node.getprevious() is not None:
+                        del node.getparent()[0]
+        else:
+            root = ET.parse(file_path).getroot()
+            for node in root.iterfind(".//element"):
+                yield 'end', node
+            for node in root.iterfind(".//relationship"):
+                yield 'end', node
 
     def _determine_layer(self, element_type: str) -> str:
         """Determine ArchiMate layer for element type"""
         if element_type:
             element_type = element_type.lower()
-            for layer, types in self.layers.items():
-                if any(t in element_type for t in types):
+            layer = self._type_to_layer.get(element_type)
+            if layer:
+                return layer
+            for layer, pattern in self._layer_patterns:
+                if pattern.search(element_type):
                     return layer
         return 'unknown'
 
@@ -117,29 +196,32 @@ class ArchiMateAnalyzer:
                 'application': {'elements': 0, 'dependencies': 0},
                 'technology': {'elements': 0, 'dependencies': 0}
             },
-            'risks': [],
+            'risks': {},
             'recommendations': []
         }
 
-        # Analyze elements
-        for element_id, element in self.elements.items():
-            # Count elements per layer
-            if element.layer in analysis['layers']:
-                analysis['layers'][element.layer]['elements'] += 1
+        # Count elements per layer
+        layer_counts = Counter(element.layer for element in self.elements.values())
+        for layer, stats in analysis['layers'].items():
+            stats['elements'] = layer_counts[layer]
 
-            # Get element risks
-            risks = []
-            if element.type in self.element_risks:
-                risks.extend(self.element_risks[element.type])
+        # Analyze elements, tallying risks by name rather than repeating them
+        risk_counts = Counter()
+        for element_id, element in self.elements.items():
+            # Get element risks; entries get their own list so callers can
+            # edit them without touching the shared per-type catalog
+            risks = self.element_risks.get(element.type, ())
 
             analysis['elements'].append({
                 'id': element_id,
                 'name': element.name,
                 'type': element.type,
                 'layer': element.layer,
-                'risks': risks
+                'risks': list(risks)
             })
-            analysis['risks'].extend(risks)
+            risk_counts.update(risks)
+
+        analysis['risks'] = dict(risk_counts)
 
         # Generate recommendations
         if analysis['risks']:
@@ -159,5 +241,9 @@ class ArchiMateAnalyzer:
 
     def export_analysis(self, analysis, filename='analysis_results.json'):
         """Export analysis results to JSON"""
-        with open(filename, 'w') as f:
-            json.dump(analysis, f, indent=4)
+        if orjson is not None:
+            with open(filename, 'wb') as f:
+                f.write(orjson.dumps(analysis, option=orjson.OPT_INDENT_2))
+        else:
+            with open(filename, 'w', encoding='utf-8') as f:
+                json.dump(analysis, f, indent=2, ensure_ascii=False)
@@ -34,7 +34,7 @@ def run_analysis(model_path):
         # Print summary
         print("\n=== Analysis Summary ===")
         print(f"Elements analyzed: {len(analysis['elements'])}")
-        print(f"Risks identified: {len(analysis['risks'])}")
+        print(f"Risks identified: {sum(analysis['risks'].values())}")
         print("\nRisks by layer:")
         for layer, stats in analysis['layers'].items():
             print(f"- {layer.capitalize()}: {stats['elements']} elements")
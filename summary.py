@@ -1,9 +1,14 @@
+import json
+
 # Print summary
 with open("analysis_results.json", "r") as f:
     results = json.load(f)
 
 print(f"Total elements analyzed: {len(results['elements'])}")
-print(f"Identified risks: {len(results['risks'])}")
+# Older analyses stored risks as a flat list rather than counts
+risks = results['risks']
+risk_total = sum(risks.values()) if isinstance(risks, dict) else len(risks)
+print(f"Identified risks: {risk_total}")
 print("\nKey recommendations:")
 for rec in results['recommendations']:
     print(f"- {rec['category']}: {rec['suggestions'][0]}")